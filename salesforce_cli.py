@@ -12,14 +12,38 @@ Note: In production, a dedicated API/integration user with limited permissions
 should be configured as the "Run As" user in the External Client App, rather
 than an admin account.
 
-Usage: python3 salesforce_cli.py
+Usage:
+    python3 salesforce_cli.py                      # interactive menu
+    python3 salesforce_cli.py query Account --limit 100 --csv out.csv
+    python3 salesforce_cli.py --help               # all headless subcommands
 """
 
 import os
+import re
+import io
+import sys
 import csv
+import json
+import argparse
+import time
+import shutil
+import functools
 import requests
+from itertools import islice
+from operator import itemgetter
+from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional; it decodes large query responses noticeably faster
+try:
+    import orjson
+    _loads, _dumps = orjson.loads, orjson.dumps
+except ImportError:
+    _loads, _dumps = json.loads, json.dumps
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,18 +53,216 @@ SF_INSTANCE_URL = os.getenv("SF_INSTANCE_URL")
 SF_CONSUMER_KEY = os.getenv("SF_CONSUMER_KEY")
 SF_CONSUMER_SECRET = os.getenv("SF_CONSUMER_SECRET")
 
+# Cached OAuth token location and lifetime assumptions (seconds)
+TOKEN_CACHE_PATH = os.path.expanduser("~/.sf_cli_token.json")
+TOKEN_DEFAULT_TTL = 3600
+TOKEN_REFRESH_MARGIN = 60
+
 # Supported Salesforce objects
 SUPPORTED_OBJECTS = ["Account", "Contact", "Lead", "Opportunity"]
 
+# Fields selected when querying records
+FIELD_MAP = {
+    "Account": "Id, Name, Industry, Phone, CreatedDate",
+    "Contact": "Id, FirstName, LastName, Email, Phone, AccountId",
+    "Lead": "Id, FirstName, LastName, Company, Status, Email",
+    "Opportunity": "Id, Name, StageName, Amount, CloseDate, AccountId",
+}
+
+# Fields written when exporting records to CSV
+EXPORT_FIELD_MAP = {
+    "Account": "Id, Name, Industry, Phone, CreatedDate",
+    "Contact": "Id, FirstName, LastName, Email, Phone",
+    "Lead": "Id, FirstName, LastName, Company, Status, Email",
+    "Opportunity": "Id, Name, StageName, Amount, CloseDate",
+}
+
+# Prompts shown when creating a record
+FIELD_PROMPTS = {
+    "Account": {"Name": "Account name", "Industry": "Industry", "Phone": "Phone"},
+    "Contact": {
+        "FirstName": "First name",
+        "LastName": "Last name",
+        "Email": "Email",
+        "Phone": "Phone",
+    },
+    "Lead": {
+        "FirstName": "First name",
+        "LastName": "Last name",
+        "Company": "Company",
+        "Email": "Email",
+    },
+    "Opportunity": {
+        "Name": "Opportunity name",
+        "StageName": "Stage (e.g. Prospecting)",
+        "CloseDate": "Close date (YYYY-MM-DD)",
+        "Amount": "Amount",
+    },
+}
+
+# Fields offered when updating a record
+FIELD_OPTIONS = {
+    "Account": ["Name", "Industry", "Phone"],
+    "Contact": ["FirstName", "LastName", "Email", "Phone"],
+    "Lead": ["FirstName", "LastName", "Company", "Status"],
+    "Opportunity": ["Name", "StageName", "Amount", "CloseDate"],
+}
+
+# Precomputed SOQL and URL-encoded query endpoints (append "+LIMIT+n" as needed)
+_SELECT_SOQL = {obj: f"SELECT {fields} FROM {obj}" for obj, fields in FIELD_MAP.items()}
+_QUERY_URLS = {obj: f"/query?q={quote_plus(soql)}" for obj, soql in _SELECT_SOQL.items()}
+_EXPORT_SOQL = {obj: f"SELECT {fields} FROM {obj}" for obj, fields in EXPORT_FIELD_MAP.items()}
+_EXPORT_FIELDNAMES = {
+    obj: [field.strip() for field in fields.split(",")]
+    for obj, fields in EXPORT_FIELD_MAP.items()
+}
+
+# Separator lines used in console output
+_SEP50 = "─" * 50
+_SEP60 = "─" * 60
+_EQ60 = "=" * 60
+_RECORD_HEADER = f"  {_SEP50}\n"
+
+# External ID field chosen per object for upserts, remembered for the session
+_EXTERNAL_ID_FIELDS = {}
+
+# Main menu actions; the last entry exits
+_ACTION_LABELS = [
+    "Query records",
+    "Create record",
+    "Update record",
+    "Delete record",
+    "Export to CSV",
+    "Bulk from CSV",
+    "Upsert from CSV by external ID",
+    "Exit",
+]
+_EXIT_CHOICE = str(len(_ACTION_LABELS))
+_ACTIONS = frozenset(str(i) for i in range(1, len(_ACTION_LABELS)))
+
+# Menus are rendered once at import
+_MENU_STR = "\n".join([
+    "\n" + _SEP60,
+    "  ACTIONS:",
+    *(f"    {i}. {label}" for i, label in enumerate(_ACTION_LABELS, 1)),
+])
+_ACTION_PROMPT = f"\n  Select action (1-{len(_ACTION_LABELS)}): "
+_OBJECT_MENU = "\n  Available objects:\n" + "\n".join(
+    f"    {i}. {obj}" for i, obj in enumerate(SUPPORTED_OBJECTS, 1)
+)
+_OBJECT_PROMPT = f"\n  Select object (1-{len(SUPPORTED_OBJECTS)}): "
+
+# REST API path prefix for the pinned API version
+API_PATH = "/services/data/v62.0"
+
+# Maximum records per sObject Collections request
+COMPOSITE_BATCH_SIZE = 200
+
+# Write buffer size for CSV exports (bytes)
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Bulk API 2.0 job status polling backoff bounds (seconds)
+BULK_POLL_INITIAL_DELAY = 0.5
+BULK_POLL_MAX_DELAY = 10.0
+
+# Give up on (and abort) a Bulk API 2.0 query job after this long (seconds)
+BULK_POLL_TIMEOUT = 1800
+
+# Stop prefetching query pages once this share of the daily API quota is used
+PREFETCH_USAGE_CEILING = 0.8
+
+# Past this share of the daily API quota, sf_request sleeps after each call
+THROTTLE_USAGE_THRESHOLD = 0.9
+THROTTLE_MAX_DELAY = 2.0
+
+# Latest daily API usage reported by Salesforce in the Sforce-Limit-Info header
+API_USAGE = {"used": 0, "total": 0}
+_LIMIT_INFO_RE = re.compile(r"api-usage=(\d+)/(\d+)")
+
+# Connect/read timeouts (seconds) applied to every HTTP call
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Shared HTTP session so keep-alive reuses the TLS connection across calls.
+# Only idempotent verbs are retried; a retried POST could create duplicates.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "PATCH", "DELETE"]),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
+def _load_cached_token():
+    """Return the cached session if it is still fresh for this org, else None."""
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get("client_id") != SF_CONSUMER_KEY:
+        return None
+    if cached.get("expires_at", 0) - time.time() <= TOKEN_REFRESH_MARGIN:
+        return None
+    return {
+        "access_token": cached["access_token"],
+        "instance_url": cached["instance_url"],
+    }
+
+
+def _save_cached_token(session: dict, expires_in: int):
+    """Persist the session token to disk, readable only by the current user."""
+    cached = {
+        **session,
+        "client_id": SF_CONSUMER_KEY,
+        "expires_at": time.time() + expires_in,
+    }
+    fd = os.open(TOKEN_CACHE_PATH, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+    # The mode above only applies on creation; tighten an existing file too
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(cached, f)
+
 
-def authenticate() -> dict:
-    """Authenticate via OAuth 2.0 Client Credentials Flow and return session info."""
+def invalidate_cached_token():
+    """Remove the cached token so the next authenticate() hits the network."""
+    try:
+        os.remove(TOKEN_CACHE_PATH)
+    except FileNotFoundError:
+        pass
+
+
+def _use_token(session: dict) -> dict:
+    """Attach the session's bearer token to the shared HTTP session."""
+    SESSION.headers["Authorization"] = f"Bearer {session['access_token']}"
+    return session
+
+
+def authenticate(use_cache: bool = True) -> dict:
+    """Authenticate via OAuth 2.0 Client Credentials Flow and return session info.
+
+    A previously cached token is reused while it has more than a minute left.
+    """
     if not all([SF_INSTANCE_URL, SF_CONSUMER_KEY, SF_CONSUMER_SECRET]):
         print("[ERROR] Missing environment variables.")
         print("Set SF_INSTANCE_URL, SF_CONSUMER_KEY, and SF_CONSUMER_SECRET")
         print("in your .env file. See .env.example for reference.")
         raise SystemExit(1)
 
+    if use_cache:
+        cached = _load_cached_token()
+        if cached:
+            return _use_token(cached)
+
     token_url = f"{SF_INSTANCE_URL}/services/oauth2/token"
     data = {
         "grant_type": "client_credentials",
@@ -48,7 +270,9 @@ def authenticate() -> dict:
         "client_secret": SF_CONSUMER_SECRET,
     }
 
-    response = requests.post(token_url, data=data)
+    # Drop any stale bearer token so it isn't sent to the token endpoint
+    response = SESSION.post(token_url, data=data, headers={"Authorization": None},
+                            timeout=REQUEST_TIMEOUT)
 
     if response.status_code != 200:
         error = response.json()
@@ -56,51 +280,155 @@ def authenticate() -> dict:
         raise SystemExit(1)
 
     auth = response.json()
-    return {
+    session = {
         "access_token": auth["access_token"],
         "instance_url": auth["instance_url"],
     }
+    # Client credentials responses usually omit expires_in; a stale token is
+    # caught by the retry-on-401 in sf_request.
+    _save_cached_token(session, int(auth.get("expires_in", TOKEN_DEFAULT_TTL)))
+    return _use_token(session)
+
+
+def _record_api_usage(response):
+    """Update API_USAGE from a response's Sforce-Limit-Info header."""
+    match = _LIMIT_INFO_RE.search(response.headers.get("Sforce-Limit-Info", ""))
+    if match:
+        API_USAGE["used"], API_USAGE["total"] = int(match.group(1)), int(match.group(2))
+
+
+def api_usage_ratio() -> float:
+    """Return the share of the daily API quota used, or 0.0 if unknown."""
+    if not API_USAGE["total"]:
+        return 0.0
+    return API_USAGE["used"] / API_USAGE["total"]
+
+
+def _throttle():
+    """Sleep proportionally once API usage passes THROTTLE_USAGE_THRESHOLD."""
+    ratio = api_usage_ratio()
+    if ratio > THROTTLE_USAGE_THRESHOLD:
+        time.sleep(min(THROTTLE_MAX_DELAY, (ratio - THROTTLE_USAGE_THRESHOLD) * 20))
+
+
+def _retry_after(response) -> float:
+    """Return the Retry-After delay in seconds, defaulting to one second."""
+    try:
+        return float(response.headers.get("Retry-After", "1"))
+    except ValueError:
+        return 1.0
+
+
+def _send(session: dict, method: str, endpoint: str, json_data: dict = None):
+    """Send one request on the shared HTTP session and record API usage."""
+    url = f"{session['instance_url']}{endpoint}"
+    body, headers = None, None
+    if json_data is not None:
+        body, headers = _dumps(json_data), {"Content-Type": "application/json"}
+    response = SESSION.request(method, url, data=body, headers=headers, timeout=REQUEST_TIMEOUT)
+    _record_api_usage(response)
+    return response
 
 
 def sf_request(session: dict, method: str, endpoint: str, json_data: dict = None) -> dict:
-    """Make an authenticated request to the Salesforce REST API."""
-    url = f"{session['instance_url']}/services/data/v62.0{endpoint}"
-    headers = {
-        "Authorization": f"Bearer {session['access_token']}",
-        "Content-Type": "application/json",
-    }
+    """Make an authenticated request to the Salesforce REST API.
+
+    `endpoint` is relative to the versioned API path, unless it already starts
+    with /services/ (as the nextRecordsUrl cursors returned by queries do).
+    """
+    if not endpoint.startswith("/services/"):
+        endpoint = f"{API_PATH}{endpoint}"
+    response = _send(session, method, endpoint, json_data)
+
+    if response.status_code == 401:
+        # Cached token expired or was revoked: fetch a fresh one and retry once
+        invalidate_cached_token()
+        session.update(authenticate(use_cache=False))
+        response = _send(session, method, endpoint, json_data)
 
-    response = requests.request(method, url, headers=headers, json=json_data)
+    if response.status_code == 429:
+        # Rate limited requests were not processed, so retrying is safe for any verb
+        time.sleep(_retry_after(response))
+        response = _send(session, method, endpoint, json_data)
+
+    _throttle()
 
     if response.status_code == 204:
         return {}
     if response.status_code >= 400:
-        error = response.json()
+        error = _loads(response.content)
         if isinstance(error, list):
             error = error[0]
         print(f"\n  [ERROR] {error.get('message', error)}")
         return None
 
-    return response.json()
+    return _loads(response.content)
 
 
-def query_records(session: dict, sobject: str, limit: int = 10):
-    """Query and display records for a given Salesforce object."""
-    field_map = {
-        "Account": "Id, Name, Industry, Phone, CreatedDate",
-        "Contact": "Id, FirstName, LastName, Email, Phone, AccountId",
-        "Lead": "Id, FirstName, LastName, Company, Status, Email",
-        "Opportunity": "Id, Name, StageName, Amount, CloseDate, AccountId",
-    }
+class QueryError(Exception):
+    """Raised when query results cannot be fetched."""
 
-    fields = field_map.get(sobject, "Id, Name")
-    query = f"SELECT {fields} FROM {sobject} LIMIT {limit}"
 
-    print(f"\n  Executing: {query}")
-    result = sf_request(session, "GET", f"/query?q={query.replace(' ', '+')}")
+def iter_query(session: dict, soql: str):
+    """Yield every record matching a SOQL query, one page at a time.
 
-    if not result:
-        return []
+    The next page is fetched in the background while the caller consumes the
+    current one. Cursors are sequential, so at most one page is in flight.
+    Raises QueryError if any page fails, so callers never mistake a
+    truncated result for a complete one.
+    """
+    result = sf_request(session, "GET", f"/query?q={quote_plus(soql)}")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while True:
+            if result is None:
+                raise QueryError(f"Query failed: {soql}")
+            pending = None
+            if not result.get("done", True) and api_usage_ratio() < PREFETCH_USAGE_CEILING:
+                pending = executor.submit(sf_request, session, "GET", result["nextRecordsUrl"])
+
+            yield from result.get("records", [])
+
+            if result.get("done", True):
+                return
+            if pending:
+                result = pending.result()
+            else:
+                result = sf_request(session, "GET", result["nextRecordsUrl"])
+
+
+@functools.lru_cache(maxsize=64)
+def _select_url(sobject: str, limit: int) -> str:
+    """Return the encoded query endpoint for an object and record limit."""
+    return f"{_QUERY_URLS[sobject]}+LIMIT+{limit}"
+
+
+def _print_records(records: list):
+    """Display records, dropping their attributes, with a single write."""
+    for record in records:
+        record.pop("attributes", None)
+
+    rendered = [
+        _RECORD_HEADER + "\n".join(f"    {k}: {v}" for k, v in record.items())
+        for record in records
+    ]
+    sys.stdout.write("\n".join(rendered) + "\n")
+    sys.stdout.flush()
+
+
+def query_records(session: dict, sobject: str, limit: int = 10, interactive: bool = True):
+    """Query and display records for a given Salesforce object.
+
+    When the result spans several pages, the next page is fetched in the
+    background while the user decides whether to view it. Non-interactive
+    callers get every page without being prompted.
+
+    Returns the records shown, or None if a request failed.
+    """
+    print(f"\n  Executing: {_SELECT_SOQL[sobject]} LIMIT {limit}")
+    result = sf_request(session, "GET", _select_url(sobject, limit))
+
+    if result is None:
+        return None
 
     records = result.get("records", [])
     if not records:
@@ -108,41 +436,39 @@ def query_records(session: dict, sobject: str, limit: int = 10):
         return records
 
     print(f"\n  Found {result['totalSize']} record(s):\n")
-    for record in records:
-        print(f"  {'─' * 50}")
-        for key, value in record.items():
-            if key == "attributes":
-                continue
-            print(f"    {key}: {value}")
-
-    return records
+    _print_records(records)
+    shown = list(records)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        while not result.get("done", True):
+            pending = None
+            if api_usage_ratio() < PREFETCH_USAGE_CEILING:
+                pending = executor.submit(sf_request, session, "GET", result["nextRecordsUrl"])
+
+            if interactive:
+                more = input(f"\n  Showing {len(shown)} of {result['totalSize']}. Next page? (yes/no): ")
+                if more.strip().lower() != "yes":
+                    break
+
+            if pending:
+                result = pending.result()
+            else:
+                result = sf_request(session, "GET", result["nextRecordsUrl"])
+            if result is None:
+                return None
+            _print_records(result.get("records", []))
+            shown.extend(result.get("records", []))
+    finally:
+        # Don't block on a speculative fetch the user declined; its page is discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return shown
 
 
 def create_record(session: dict, sobject: str):
     """Create a new record for a given Salesforce object."""
-    field_prompts = {
-        "Account": {"Name": "Account name", "Industry": "Industry", "Phone": "Phone"},
-        "Contact": {
-            "FirstName": "First name",
-            "LastName": "Last name",
-            "Email": "Email",
-            "Phone": "Phone",
-        },
-        "Lead": {
-            "FirstName": "First name",
-            "LastName": "Last name",
-            "Company": "Company",
-            "Email": "Email",
-        },
-        "Opportunity": {
-            "Name": "Opportunity name",
-            "StageName": "Stage (e.g. Prospecting)",
-            "CloseDate": "Close date (YYYY-MM-DD)",
-            "Amount": "Amount",
-        },
-    }
-
-    prompts = field_prompts.get(sobject, {})
+    prompts = FIELD_PROMPTS.get(sobject, {})
     data = {}
 
     print(f"\n  Enter details for new {sobject}:")
@@ -171,14 +497,7 @@ def update_record(session: dict, sobject: str):
     print(f"  Enter fields to update (leave blank to skip):")
     updates = {}
 
-    field_options = {
-        "Account": ["Name", "Industry", "Phone"],
-        "Contact": ["FirstName", "LastName", "Email", "Phone"],
-        "Lead": ["FirstName", "LastName", "Company", "Status"],
-        "Opportunity": ["Name", "StageName", "Amount", "CloseDate"],
-    }
-
-    for field in field_options.get(sobject, []):
+    for field in FIELD_OPTIONS.get(sobject, []):
         value = input(f"    {field}: ").strip()
         if value:
             updates[field] = value
@@ -209,58 +528,438 @@ def delete_record(session: dict, sobject: str):
         print(f"\n  ✓ {sobject} {record_id} deleted successfully!")
 
 
-def export_to_csv(session: dict, sobject: str):
-    """Export records to a CSV file."""
-    field_map = {
-        "Account": "Id, Name, Industry, Phone, CreatedDate",
-        "Contact": "Id, FirstName, LastName, Email, Phone",
-        "Lead": "Id, FirstName, LastName, Company, Status, Email",
-        "Opportunity": "Id, Name, StageName, Amount, CloseDate",
+def bulk_query_csv(session: dict, soql: str, filename: str):
+    """Run a Bulk API 2.0 query job and stream its CSV results to a file.
+
+    Returns the number of records written, or None if the job could not be
+    created (e.g. the object is not supported by Bulk API 2.0). Raises
+    QueryError if a created job fails, times out, or its results cannot be
+    downloaded.
+    """
+    job = sf_request(session, "POST", "/jobs/query", {
+        "operation": "query",
+        "query": soql,
+        "contentType": "CSV",
+        "lineEnding": "LF",
+    })
+    if not job:
+        return None
+
+    job_id = job["id"]
+    delay = BULK_POLL_INITIAL_DELAY
+    deadline = time.monotonic() + BULK_POLL_TIMEOUT
+    while True:
+        if time.monotonic() > deadline:
+            sf_request(session, "PATCH", f"/jobs/query/{job_id}", {"state": "Aborted"})
+            raise QueryError(f"Bulk query job {job_id} did not finish in {BULK_POLL_TIMEOUT}s; aborted")
+        status = sf_request(session, "GET", f"/jobs/query/{job_id}")
+        if not status:
+            raise QueryError(f"Could not read status of bulk query job {job_id}")
+        if status["state"] == "JobComplete":
+            break
+        if status["state"] in ("Failed", "Aborted"):
+            raise QueryError(f"Bulk query job {status['state']}: {status.get('errorMessage', '')}")
+        time.sleep(delay)
+        delay = min(delay * 2, BULK_POLL_MAX_DELAY)
+
+    url = f"{session['instance_url']}{API_PATH}/jobs/query/{job_id}/results"
+    params = {}
+    exported = 0
+    with open(filename, "wb") as csvfile:
+        while True:
+            with SESSION.get(url, params=params, headers={"Accept": "text/csv"},
+                             stream=True, timeout=REQUEST_TIMEOUT) as response:
+                _record_api_usage(response)
+                if response.status_code >= 400:
+                    raise QueryError(f"Failed to download bulk results: HTTP {response.status_code}")
+                response.raw.decode_content = True
+                if params:
+                    # Every results page repeats the header row
+                    response.raw.readline()
+                shutil.copyfileobj(response.raw, csvfile)
+                exported += int(response.headers.get("Sforce-NumberOfRecords", 0))
+                locator = response.headers.get("Sforce-Locator")
+
+            if not locator or locator == "null":
+                return exported
+            params = {"locator": locator}
+
+
+def _export_via_rest(session: dict, soql: str, fieldnames: list, filename: str) -> int:
+    """Stream REST query results to a CSV file and return the record count."""
+    # Query results always carry every selected field, so pull values by position
+    getter = itemgetter(*fieldnames)
+    exported = 0
+
+    def rows():
+        nonlocal exported
+        for exported, record in enumerate(iter_query(session, soql), 1):
+            yield getter(record)
+
+    with open(filename, "wb", buffering=EXPORT_BUFFER_SIZE) as raw, \
+            io.TextIOWrapper(raw, encoding="utf-8", newline="") as csvfile:
+        # Match the LF line endings requested from Bulk API 2.0
+        writer = csv.writer(csvfile, lineterminator="\n")
+        writer.writerow(fieldnames)
+        writer.writerows(rows())
+    return exported
+
+
+def export_to_csv(session: dict, sobject: str, filename: str = None):
+    """Export records to a CSV file (timestamped name unless one is given).
+
+    Returns the number of records exported, or None if the export failed.
+    """
+    query = _EXPORT_SOQL[sobject]
+    fieldnames = _EXPORT_FIELDNAMES[sobject]
+
+    if not filename:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{sobject}_export_{timestamp}.csv"
+
+    print(f"\n  Running Bulk API 2.0 query: {query}")
+    try:
+        exported = bulk_query_csv(session, query, filename)
+        if exported is None:
+            print(f"  Bulk API unavailable for {sobject}, falling back to REST query.")
+            exported = _export_via_rest(session, query, fieldnames, filename)
+    except QueryError as e:
+        if os.path.exists(filename):
+            os.remove(filename)
+        print(f"\n  [ERROR] {sobject} export failed: {e}")
+        return None
+
+    if not exported:
+        os.remove(filename)
+        print(f"\n  No {sobject} records to export.")
+        return 0
+
+    print(f"\n  ✓ Exported {exported} records to {filename}")
+    return exported
+
+
+def _chunks(rows, size: int = COMPOSITE_BATCH_SIZE):
+    """Yield successive lists of at most `size` rows."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _collection_body(sobject: str, rows: list) -> dict:
+    """Build an sObject Collections request body for the given rows."""
+    return {
+        "allOrNone": False,
+        "records": [{"attributes": {"type": sobject}, **row} for row in rows],
     }
 
-    fields = field_map.get(sobject, "Id, Name")
-    query = f"SELECT {fields} FROM {sobject}"
-    result = sf_request(session, "GET", f"/query?q={query.replace(' ', '+')}")
 
-    if not result:
+def bulk_create(session: dict, sobject: str, rows) -> list:
+    """Create records in batches of 200 via the sObject Collections API.
+
+    Stops at the first failed request, so fewer results than rows means
+    the remaining rows were not sent.
+    """
+    results = []
+    for chunk in _chunks(rows):
+        result = sf_request(session, "POST", "/composite/sobjects", _collection_body(sobject, chunk))
+        if result is None:
+            break
+        results.extend(result)
+    return results
+
+
+def bulk_update(session: dict, sobject: str, rows) -> list:
+    """Update records (each row must include Id) in batches of 200.
+
+    Stops at the first failed request, so fewer results than rows means
+    the remaining rows were not sent.
+    """
+    results = []
+    for chunk in _chunks(rows):
+        result = sf_request(session, "PATCH", "/composite/sobjects", _collection_body(sobject, chunk))
+        if result is None:
+            break
+        results.extend(result)
+    return results
+
+
+def bulk_delete(session: dict, record_ids) -> list:
+    """Delete records by ID in batches of 200.
+
+    Stops at the first failed request, so fewer results than rows means
+    the remaining rows were not sent.
+    """
+    results = []
+    for chunk in _chunks(record_ids):
+        endpoint = f"/composite/sobjects?ids={','.join(chunk)}&allOrNone=false"
+        result = sf_request(session, "DELETE", endpoint)
+        if result is None:
+            break
+        results.extend(result)
+    return results
+
+
+def _print_bulk_summary(sobject: str, action: str, results: list, total: int) -> bool:
+    """Print a summary for a batched operation over `total` input rows.
+
+    The bulk helpers stop at the first failed request, so rows without a
+    result were never sent. Returns True only if every row succeeded.
+    """
+    failed = [r for r in results if not r.get("success")]
+    unsent = total - len(results)
+    marker = "✓" if not unsent else "[!]"
+    print(f"\n  {marker} {len(results) - len(failed)} {sobject} record(s) {action}")
+    if unsent:
+        print(f"  [!] {unsent} record(s) not attempted because a request failed.")
+    if failed:
+        print(f"  [!] {len(failed)} record(s) failed:")
+        for r in failed:
+            messages = "; ".join(e.get("message", "") for e in r.get("errors", []))
+            print(f"    {r.get('id') or '(no id)'}: {messages}")
+    return not unsent and not failed
+
+
+def _read_csv_rows(path: str) -> list:
+    """Read CSV rows as dicts, dropping empty cells.
+
+    Blank columns are dropped so they don't overwrite existing values.
+    utf-8-sig strips the byte-order mark Excel and Salesforce exports add.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as csvfile:
+        return [{k: v for k, v in row.items() if v} for row in csv.DictReader(csvfile)]
+
+
+def _rows_have_ids(rows: list) -> bool:
+    """Check every row has an Id value, reporting the problem if not."""
+    if any("Id" not in row for row in rows):
+        print("  Every row needs an Id column for update/delete. Aborting.")
+        return False
+    return True
+
+
+def _prompt_csv_rows() -> list:
+    """Prompt for a CSV path and return its rows, or an empty list."""
+    path = input("  CSV file path: ").strip()
+    if not os.path.isfile(path):
+        print(f"  File not found: {path}")
+        return []
+
+    rows = _read_csv_rows(path)
+    if not rows:
+        print("  CSV contains no rows. Aborting.")
+    return rows
+
+
+def bulk_from_csv(session: dict, sobject: str):
+    """Create, update, or delete records in batches from a CSV file."""
+    operation = input("\n  Operation (create/update/delete): ").strip().lower()
+    if operation not in ("create", "update", "delete"):
+        print("  Invalid operation. Aborting.")
         return
 
-    records = result.get("records", [])
-    if not records:
-        print(f"\n  No {sobject} records to export.")
+    rows = _prompt_csv_rows()
+    if not rows:
         return
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{sobject}_export_{timestamp}.csv"
+    if operation != "create" and not _rows_have_ids(rows):
+        return
 
-    fieldnames = [key for key in records[0].keys() if key != "attributes"]
-    with open(filename, "w", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for record in records:
-            row = {k: v for k, v in record.items() if k != "attributes"}
-            writer.writerow(row)
+    if operation == "create":
+        _print_bulk_summary(sobject, "created", bulk_create(session, sobject, rows), len(rows))
+    elif operation == "update":
+        _print_bulk_summary(sobject, "updated", bulk_update(session, sobject, rows), len(rows))
+    else:
+        confirm = input(f"  Confirm delete {len(rows)} record(s)? (yes/no): ").strip().lower()
+        if confirm != "yes":
+            print("  Delete cancelled.")
+            return
+        results = bulk_delete(session, [row["Id"] for row in rows])
+        _print_bulk_summary(sobject, "deleted", results, len(rows))
+
+
+def upsert_by_external_id(session: dict, sobject: str, ext_field: str, rows) -> list:
+    """Upsert records matched on an external ID field in batches of 200."""
+    results = []
+    endpoint = f"/composite/sobjects/{sobject}/{ext_field}"
+    for chunk in _chunks(rows):
+        result = sf_request(session, "PATCH", endpoint, _collection_body(sobject, chunk))
+        if result is None:
+            break
+        results.extend(result)
+    return results
+
+
+def upsert_from_csv(session: dict, sobject: str):
+    """Upsert records from a CSV file keyed on an external ID field."""
+    remembered = _EXTERNAL_ID_FIELDS.get(sobject)
+    if remembered:
+        prompt = f"\n  External ID field for {sobject} [{remembered}]: "
+    else:
+        prompt = f"\n  External ID field for {sobject} (e.g. External_Id__c): "
+    ext_field = input(prompt).strip() or remembered
+    if not ext_field:
+        print("  No field entered. Aborting.")
+        return
 
-    print(f"\n  ✓ Exported {len(records)} records to {filename}")
+    rows = _prompt_csv_rows()
+    if not rows:
+        return
+
+    if any(ext_field not in row for row in rows):
+        print(f"  Every row needs a {ext_field} value. Aborting.")
+        return
+
+    results = upsert_by_external_id(session, sobject, ext_field, rows)
+    created = sum(1 for r in results if r.get("success") and r.get("created"))
+    _print_bulk_summary(sobject, f"upserted ({created} created)", results, len(rows))
+
+    # Only remember a field Salesforce actually accepted as the upsert key
+    if len(results) == len(rows) and any(r.get("success") for r in results):
+        _EXTERNAL_ID_FIELDS[sobject] = ext_field
 
 
 def select_object() -> str:
     """Prompt user to select a Salesforce object."""
-    print("\n  Available objects:")
-    for i, obj in enumerate(SUPPORTED_OBJECTS, 1):
-        print(f"    {i}. {obj}")
+    print(_OBJECT_MENU)
 
     while True:
-        choice = input("\n  Select object (1-4): ").strip()
+        choice = input(_OBJECT_PROMPT).strip()
         if choice.isdigit() and 1 <= int(choice) <= len(SUPPORTED_OBJECTS):
             return SUPPORTED_OBJECTS[int(choice) - 1]
         print("  Invalid selection. Try again.")
 
 
+def _field_assignment(text: str) -> tuple:
+    """Parse a Field=Value command-line argument."""
+    field, sep, value = text.partition("=")
+    if not sep or not field:
+        raise argparse.ArgumentTypeError(f"expected Field=Value, got {text!r}")
+    return field, value
+
+
+def _existing_file(path: str) -> str:
+    """Validate that a CSV input path exists before authenticating."""
+    if not os.path.isfile(path):
+        raise argparse.ArgumentTypeError(f"file not found: {path}")
+    return path
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for headless (non-interactive) use."""
+    parser = argparse.ArgumentParser(
+        description="Salesforce CLI Tool. Run without a command for the interactive menu.",
+    )
+    parser.add_argument("--token-file", help=f"OAuth token cache path (default {TOKEN_CACHE_PATH})")
+    commands = parser.add_subparsers(dest="command")
+
+    query = commands.add_parser("query", help="query records")
+    query.add_argument("sobject", choices=SUPPORTED_OBJECTS)
+    query.add_argument("--limit", type=int, default=10)
+    query.add_argument("--csv", help="write results to this CSV file instead of printing")
+
+    create = commands.add_parser("create", help="create one record, or many from --csv")
+    create.add_argument("sobject", choices=SUPPORTED_OBJECTS)
+    create.add_argument("--set", type=_field_assignment, action="append", default=[],
+                        metavar="FIELD=VALUE", help="field value (repeatable)")
+    create.add_argument("--csv", type=_existing_file, help="CSV of records to create in batches")
+
+    update = commands.add_parser("update", help="update one record, or many from --csv")
+    update.add_argument("sobject", choices=SUPPORTED_OBJECTS)
+    update.add_argument("--id", help="record ID to update")
+    update.add_argument("--set", type=_field_assignment, action="append", default=[],
+                        metavar="FIELD=VALUE", help="field value (repeatable)")
+    update.add_argument("--csv", type=_existing_file,
+                        help="CSV of records (with Id column) to update in batches")
+
+    delete = commands.add_parser("delete", help="delete records by ID")
+    delete.add_argument("sobject", choices=SUPPORTED_OBJECTS)
+    delete.add_argument("--id", action="append", default=[], help="record ID (repeatable)")
+    delete.add_argument("--csv", type=_existing_file, help="CSV with an Id column of records to delete")
+
+    export = commands.add_parser("export", help="export all records to CSV")
+    export.add_argument("sobject", choices=SUPPORTED_OBJECTS)
+    export.add_argument("--output", help="output file (default: timestamped name)")
+
+    return parser
+
+
+def run_command(session: dict, args: argparse.Namespace) -> int:
+    """Run a headless subcommand and return the process exit code."""
+    sobject = args.sobject
+
+    if args.command == "query":
+        if args.csv:
+            soql = f"{_SELECT_SOQL[sobject]} LIMIT {args.limit}"
+            fieldnames = [field.strip() for field in FIELD_MAP[sobject].split(",")]
+            try:
+                exported = _export_via_rest(session, soql, fieldnames, args.csv)
+            except QueryError:
+                os.remove(args.csv)
+                print(f"  [ERROR] {sobject} query failed; incomplete file removed.")
+                return 1
+            print(f"  ✓ Exported {exported} records to {args.csv}")
+            return 0
+        return 0 if query_records(session, sobject, args.limit, interactive=False) is not None else 1
+
+    if args.command == "export":
+        return 0 if export_to_csv(session, sobject, args.output) is not None else 1
+
+    rows = _read_csv_rows(args.csv) if args.csv else []
+    if rows and args.command in ("update", "delete") and not _rows_have_ids(rows):
+        return 2
+
+    if args.command == "create":
+        if rows:
+            results = bulk_create(session, sobject, rows)
+            return 0 if _print_bulk_summary(sobject, "created", results, len(rows)) else 1
+        if not args.set:
+            print("  [ERROR] Provide --set FIELD=VALUE or --csv.")
+            return 2
+        result = sf_request(session, "POST", f"/sobjects/{sobject}", dict(args.set))
+        if not result:
+            return 1
+        print(f"  ✓ {sobject} created: {result['id']}")
+        return 0
+
+    if args.command == "update":
+        if rows:
+            results = bulk_update(session, sobject, rows)
+            return 0 if _print_bulk_summary(sobject, "updated", results, len(rows)) else 1
+        if not (args.id and args.set):
+            print("  [ERROR] Provide --id with --set FIELD=VALUE, or --csv.")
+            return 2
+        result = sf_request(session, "PATCH", f"/sobjects/{sobject}/{args.id}", dict(args.set))
+        if result is None:
+            return 1
+        print(f"  ✓ {sobject} {args.id} updated")
+        return 0
+
+    # delete
+    record_ids = args.id + [row["Id"] for row in rows]
+    if not record_ids:
+        print("  [ERROR] Provide --id or a --csv with an Id column.")
+        return 2
+    results = bulk_delete(session, record_ids)
+    return 0 if _print_bulk_summary(sobject, "deleted", results, len(record_ids)) else 1
+
+
 def main():
-    print("=" * 60)
+    global TOKEN_CACHE_PATH
+
+    args = build_parser().parse_args()
+    if args.token_file:
+        TOKEN_CACHE_PATH = os.path.expanduser(args.token_file)
+
+    if args.command:
+        session = authenticate()
+        raise SystemExit(run_command(session, args))
+
+    print(_EQ60)
     print("Salesforce CLI Tool (OAuth 2.0 Client Credentials)")
-    print("=" * 60)
+    print(_EQ60)
 
     # Authenticate
     print("\n[*] Authenticating to Salesforce via OAuth 2.0...")
@@ -268,22 +967,15 @@ def main():
     print("    ✓ Connected successfully")
 
     while True:
-        print("\n" + "─" * 60)
-        print("  ACTIONS:")
-        print("    1. Query records")
-        print("    2. Create record")
-        print("    3. Update record")
-        print("    4. Delete record")
-        print("    5. Export to CSV")
-        print("    6. Exit")
-
-        choice = input("\n  Select action (1-6): ").strip()
-
-        if choice == "6":
+        print(_MENU_STR)
+
+        choice = input(_ACTION_PROMPT).strip()
+
+        if choice == _EXIT_CHOICE:
             print("\n  Goodbye!")
             break
 
-        if choice not in ("1", "2", "3", "4", "5"):
+        if choice not in _ACTIONS:
             print("  Invalid selection.")
             continue
 
@@ -300,6 +992,10 @@ def main():
             delete_record(session, sobject)
         elif choice == "5":
             export_to_csv(session, sobject)
+        elif choice == "6":
+            bulk_from_csv(session, sobject)
+        elif choice == "7":
+            upsert_from_csv(session, sobject)
 
 
 if __name__ == "__main__":